@@ -4,10 +4,14 @@ setup(
     name="trading_bot",
     version="0.1.0",
     packages=find_packages(),
+    python_requires=">=3.10",
     install_requires=[
         "pandas>=1.5.0",
         "numpy>=1.21.0",
+        "numba>=0.56.0",
         "requests>=2.26.0",
+        "orjson>=3.6.0",
+        "httpx[http2]>=0.24.0",
         "zoneinfo>=2.1.0"
     ],
     entry_points={
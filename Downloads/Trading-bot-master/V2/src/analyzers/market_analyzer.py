@@ -1,14 +1,58 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import json
+import math
+import os
 from typing import Dict, List, Tuple
+import numpy as np
+from src.utils._njit import njit
 from .utils.helper import make_post_or_get_request
-from functools import lru_cache
+from src.utils.cache_manager import cache
+
+# Sensitivity of each sector to economic data (higher is more sensitive)
+_SECTOR_SENSITIVITY: Dict[str, float] = {
+    'technology': 0.7,    # Less sensitive to economic data
+    'healthcare': 0.6,
+    'consumer_staples': 0.3,
+    'utilities': 0.2,
+    'financials': 0.9,    # More sensitive to economic data
+    'industrials': 0.8,
+    'consumer_discretionary': 0.8,
+    'materials': 0.7,
+    'energy': 0.6,
+    'real_estate': 0.8
+}
+
+# Position size scaling per economic risk level
+RISK_FACTOR: Dict[str, float] = {
+    "low": 1.0,
+    "medium": 0.7,
+    "high": 0.5
+}
+
+@njit('float64(float64[:])', cache=True, fastmath=True)
+def _std(prices):
+    """Population standard deviation in a single Welford pass"""
+    mean = 0.0
+    m2 = 0.0
+    for i in range(prices.shape[0]):
+        delta = prices[i] - mean
+        mean += delta / (i + 1)
+        m2 += (prices[i] - mean) * delta
+    return math.sqrt(m2 / prices.shape[0])
 
 class MarketAnalyzer:
     def __init__(self):
         self.bls_api_url = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
-        self.bls_api_key = "644e7c11385b4defbffe882d300457e2"  # Register at https://data.bls.gov/registrationEngine/
+        self.bls_api_key = os.environ.get("BLS_API_KEY", "")  # Register at https://data.bls.gov/registrationEngine/
+        # Static POST body; only the series id and year range vary between calls.
+        # Without a key, leave registrationkey out and use the unregistered tier
+        registration = (',"registrationkey":' + json.dumps(self.bls_api_key).replace('%', '%%')
+                        if self.bls_api_key else '')
+        self._bls_body = '{"seriesid":["%s"],"startyear":"%s","endyear":"%s"' + registration + '}'
         
         # Important economic indicators and their series IDs
         self.indicators = {
@@ -22,30 +66,44 @@ class MarketAnalyzer:
         }
         
         # Cache for economic data
-        self._cache = {}
         self._cache_duration = 3600  # 1 hour cache for economic data
         
-    @lru_cache(maxsize=100)
-    def get_economic_data(self, series_id: str, months: int = 12) -> List[Dict]:
-        """Get economic data from BLS API"""
+        # Keep-alive connection pool for BLS requests
+        self._http = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        self._http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+        self._http.headers.update({'Content-type': 'application/json'})
+        
+    def get_economic_data(self, series_id: str, start_year: int = None,
+                          end_year: int = None) -> List[Dict]:
+        """Get economic data from BLS API, cached for _cache_duration seconds.
+
+        Defaults to last year through the current year when no years are given.
+        """
+        if end_year is None:
+            end_year = datetime.now().year
+        if start_year is None:
+            start_year = end_year - 1
+        # Symbols analyzed in parallel share one BLS request per series
+        data = cache.get_or_set(f"bls:{series_id}:{start_year}:{end_year}",
+                                lambda: self._fetch_economic_data(series_id, start_year, end_year),
+                                ttl_seconds=self._cache_duration)
+        return data if data is not None else []
+
+    def _fetch_economic_data(self, series_id: str, start_year: int, end_year: int):
+        """POST one series to the BLS API; None on failure so the result isn't cached"""
         try:
-            headers = {'Content-type': 'application/json'}
-            data = json.dumps({
-                "seriesid": [series_id],
-                "startyear": str(datetime.now().year - 1),
-                "endyear": str(datetime.now().year),
-                "registrationkey": self.bls_api_key
-            })
+            data = self._bls_body % (series_id, start_year, end_year)
             
-            response = requests.post(self.bls_api_url, data=data, headers=headers)
+            response = self._http.post(self.bls_api_url, data=data, timeout=(3, 10))
             result = response.json()
             
             if 'Results' in result and result['Results']:
                 return result['Results']['series'][0]['data']
-            return []
+            return None
         except Exception as e:
             print(f"Error getting economic data for {series_id}: {str(e)}")
-            return []
+            return None
     
     def analyze_economic_conditions(self) -> Dict:
         """Analyze current economic conditions using BLS data"""
@@ -54,9 +112,17 @@ class MarketAnalyzer:
             conditions = {}
             risk_factors = 0
             total_factors = len(self.indicators)
+            year = datetime.now().year
+            
+            # Fetch all indicators concurrently; the calls are independent and IO-bound
+            with ThreadPoolExecutor(max_workers=total_factors) as executor:
+                futures = {executor.submit(self.get_economic_data, series_id,
+                                           start_year=year - 1, end_year=year): indicator
+                           for indicator, series_id in self.indicators.items()}
+                results = {futures[future]: future.result() for future in as_completed(futures)}
             
-            for indicator, series_id in self.indicators.items():
-                data = self.get_economic_data(series_id)
+            for indicator in self.indicators:
+                data = results[indicator]
                 if not data:
                     continue
                 
@@ -111,18 +177,7 @@ class MarketAnalyzer:
         
         # Analyze sector sensitivity to economic conditions
         sector = stock_data.get('sector', '').lower() if stock_data else ''
-        sector_sensitivity = {
-            'technology': 0.7,    # Less sensitive to economic data
-            'healthcare': 0.6,
-            'consumer_staples': 0.3,
-            'utilities': 0.2,
-            'financials': 0.9,    # More sensitive to economic data
-            'industrials': 0.8,
-            'consumer_discretionary': 0.8,
-            'materials': 0.7,
-            'energy': 0.6,
-            'real_estate': 0.8
-        }.get(sector, 0.5)
+        sector_sensitivity = _SECTOR_SENSITIVITY.get(sector, 0.5)
         
         # Adjust sentiment based on sector sensitivity
         adjusted_sentiment = economic_data['sentiment'] * sector_sensitivity
@@ -138,17 +193,11 @@ class MarketAnalyzer:
     
     def calculate_volatility(self, prices: List[float]) -> float:
         """Calculate market volatility using standard deviation"""
-        import numpy as np
-        return np.std(prices) if len(prices) > 0 else 0
+        if len(prices) == 0:
+            return 0
+        return _std(np.asarray(prices, dtype=np.float64))
     
     def adjust_position_size(self, base_position: float, volatility: float, risk_level: str) -> float:
         """Adjust position size based on volatility and risk level"""
         volatility_factor = 1 - (volatility * 2)  # Reduce position size as volatility increases
-        
-        risk_factors = {
-            "low": 1.0,
-            "medium": 0.7,
-            "high": 0.5
-        }
-        
-        return base_position * max(0.2, volatility_factor * risk_factors[risk_level])
+        return base_position * max(0.2, volatility_factor * RISK_FACTOR[risk_level])
@@ -1,33 +1,73 @@
+import asyncio
 import json
-from datetime import datetime, timedelta
+import threading
 from typing import Dict, List, Tuple
-from .utils.helper import make_post_or_get_request
+import httpx
+import numpy as np
+from .utils.helper import make_post_or_get_request, HEADERS, json_loads
+from src.utils.cache_manager import cache
 
 class OrderFlowAnalyzer:
     def __init__(self):
         self.cache_duration = 300  # 5 minutes cache
-        self._cache = {}
+        self.max_option_connections = 32  # Cap concurrent market data requests
+        self.id_cache_duration = 86400  # Instrument and chain ids change on the order of days
+        # An AsyncClient is bound to the event loop it first runs on, so each
+        # calling thread keeps its own loop and client for the analyzer's lifetime
+        self._local = threading.local()
         
+    async def _fetch_option(self, client: httpx.AsyncClient, option_id: str) -> Dict:
+        """Get market data for a single option contract"""
+        try:
+            response = await client.get(f"https://api.robinhood.com/marketdata/options/{option_id}/")
+            if response.status_code != 200:
+                return {}
+            return json_loads(response.content)
+        except Exception as e:
+            print(f"Error getting option market data for {option_id}: {str(e)}")
+            return {}
+
+    async def _fetch_options_market_data(self, client: httpx.AsyncClient, option_ids: List[str]) -> List[Dict]:
+        """Get market data for all option contracts concurrently, multiplexed over HTTP/2"""
+        return await asyncio.gather(*(self._fetch_option(client, oid) for oid in option_ids))
+
+    def _run_options_fetch(self, option_ids: List[str]) -> List[Dict]:
+        """Run the options fan-out on this thread's persistent loop and client"""
+        local = self._local
+        if not hasattr(local, 'loop'):
+            local.loop = asyncio.new_event_loop()
+            limits = httpx.Limits(max_connections=self.max_option_connections)
+            local.client = httpx.AsyncClient(http2=True, headers=HEADERS, limits=limits, timeout=10.0)
+        return local.loop.run_until_complete(self._fetch_options_market_data(local.client, option_ids))
+
     def get_options_data(self, symbol: str) -> Dict:
         """Get options chain data including volume and open interest"""
         try:
             # Get instrument ID first
-            instrument_url = f"https://api.robinhood.com/instruments/?symbol={symbol}"
-            instrument_response = make_post_or_get_request(instrument_url)
-            
-            if not instrument_response or 'results' not in instrument_response or not instrument_response['results']:
-                return {'call_volume': 0, 'put_volume': 0, 'put_call_ratio': 1.0}
-            
-            instrument_id = instrument_response['results'][0]['id']
+            instrument_key = f"instrument_id:{symbol}"
+            instrument_id = cache.get(instrument_key, ttl_seconds=self.id_cache_duration)
+            if instrument_id is None:
+                instrument_url = f"https://api.robinhood.com/instruments/?symbol={symbol}"
+                instrument_response = make_post_or_get_request(instrument_url)
+                
+                if not instrument_response or 'results' not in instrument_response or not instrument_response['results']:
+                    return {'call_volume': 0, 'put_volume': 0, 'put_call_ratio': 1.0}
+                
+                instrument_id = instrument_response['results'][0]['id']
+                cache.set(instrument_key, instrument_id)
             
             # Get options chain data
-            chain_url = f"https://api.robinhood.com/options/chains/?equity_instrument_id={instrument_id}"
-            chain_response = make_post_or_get_request(chain_url)
-            
-            if not chain_response or 'results' not in chain_response or not chain_response['results']:
-                return {'call_volume': 0, 'put_volume': 0, 'put_call_ratio': 1.0}
-            
-            chain_id = chain_response['results'][0]['id']
+            chain_key = f"chain_id:{instrument_id}"
+            chain_id = cache.get(chain_key, ttl_seconds=self.id_cache_duration)
+            if chain_id is None:
+                chain_url = f"https://api.robinhood.com/options/chains/?equity_instrument_id={instrument_id}"
+                chain_response = make_post_or_get_request(chain_url)
+                
+                if not chain_response or 'results' not in chain_response or not chain_response['results']:
+                    return {'call_volume': 0, 'put_volume': 0, 'put_call_ratio': 1.0}
+                
+                chain_id = chain_response['results'][0]['id']
+                cache.set(chain_key, chain_id)
             
             # Get options market data
             options_url = f"https://api.robinhood.com/options/instruments/?chain_id={chain_id}&state=active"
@@ -40,11 +80,11 @@ class OrderFlowAnalyzer:
             total_call_volume = 0
             total_put_volume = 0
             
-            # Process all options
-            for option in options_response['results']:
-                market_url = f"https://api.robinhood.com/marketdata/options/{option['id']}/"
-                market_data = make_post_or_get_request(market_url)
-            
+            # Fetch market data for all options at once, then split into calls and puts
+            options = options_response['results']
+            market_data_list = self._run_options_fetch([option['id'] for option in options])
+
+            for option, market_data in zip(options, market_data_list):
                 if market_data and 'volume' in market_data:
                     volume = float(market_data.get('volume', 0))
                     if option['type'] == 'call':
@@ -87,16 +127,11 @@ class OrderFlowAnalyzer:
             prev_price = float(quote.get('previous_close', 0))
             price_change = current_price - prev_price
             
-            # Estimate buy/sell volume based on price movement
-            if price_change > 0:
-                buy_volume = volume * 0.6  # Assume 60% buys in upward movement
-                sell_volume = volume * 0.4
-            elif price_change < 0:
-                buy_volume = volume * 0.4  # Assume 40% buys in downward movement
-                sell_volume = volume * 0.6
-            else:
-                buy_volume = volume * 0.5  # Assume equal distribution if no price change
-                sell_volume = volume * 0.5
+            # Estimate buy/sell volume based on price movement:
+            # 60% buys on upward movement, 40% on downward, 50% if unchanged
+            direction = (price_change > 0) - (price_change < 0)
+            buy_volume = volume * (0.5 + 0.1 * direction)
+            sell_volume = volume - buy_volume
             
             buy_sell_ratio = buy_volume / sell_volume if sell_volume > 0 else 1.0
             
@@ -127,13 +162,14 @@ class OrderFlowAnalyzer:
             if not response or 'historicals' not in response:
                 return {'avg_volume': 0, 'volume_trend': 0}
             
-            volumes = [float(bar['volume']) for bar in response['historicals']]
-            if not volumes:
+            bars = response['historicals']
+            if not bars:
                 return {'avg_volume': 0, 'volume_trend': 0}
             
-            avg_volume = sum(volumes) / len(volumes)
+            volumes = np.fromiter((bar['volume'] for bar in bars), dtype=np.float64, count=len(bars))
+            avg_volume = float(volumes.mean())
             # Calculate volume trend (positive means increasing volume)
-            volume_trend = (volumes[-1] / avg_volume) - 1 if avg_volume > 0 else 0
+            volume_trend = float(volumes[-1] / avg_volume) - 1 if avg_volume > 0 else 0
             
             return {
                 'avg_volume': avg_volume,
@@ -146,11 +182,10 @@ class OrderFlowAnalyzer:
     def analyze_order_flow(self, symbol: str) -> Dict:
         """Analyze order flow combining options data, order book, and volume patterns"""
         # Check cache first
-        cache_key = f"{symbol}"
-        if cache_key in self._cache:
-            cached_time, cached_data = self._cache[cache_key]
-            if datetime.now() - cached_time < timedelta(seconds=self.cache_duration):
-                return cached_data
+        cache_key = f"of:{symbol}"
+        cached = cache.get(cache_key, ttl_seconds=self.cache_duration)
+        if cached is not None:
+            return cached
         
         options_data = self.get_options_data(symbol)
         order_book = self.get_order_book(symbol)
@@ -187,7 +222,7 @@ class OrderFlowAnalyzer:
         }
         
         # Cache the results
-        self._cache[cache_key] = (datetime.now(), analysis)
+        cache.set(cache_key, analysis)
         
         return analysis
 
@@ -1,45 +1,136 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class Position:
+    entry_price: float
+    quantity: float
+    entry_time: datetime
+    highest_price: float
 
 
 class PositionManager:
-    def __init__(self):
-        self.positions: Dict[str, Dict] = {}
+    """Open positions stored column-wise so exit checks can run over all symbols at once"""
+
+    def __init__(self, capacity: int = 16):
+        self._idx: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._entry = np.empty(capacity, dtype=np.float64)
+        self._qty = np.empty(capacity, dtype=np.float64)
+        self._high = np.empty(capacity, dtype=np.float64)
+        self._time = np.empty(capacity, dtype='datetime64[ns]')
+
+    def _grow(self):
+        capacity = self._entry.shape[0] * 2
+        self._entry = np.resize(self._entry, capacity)
+        self._qty = np.resize(self._qty, capacity)
+        self._high = np.resize(self._high, capacity)
+        self._time = np.resize(self._time, capacity)
 
     def add_position(self, symbol: str, quantity: float, price: float):
-        self.positions[symbol] = {
-            "entry_price": price,
-            "quantity": quantity,
-            "entry_time": datetime.now(),
-            "highest_price": price
-        }
+        if symbol in self._idx:
+            i = self._idx[symbol]
+        else:
+            i = len(self._symbols)
+            if i == self._entry.shape[0]:
+                self._grow()
+            self._idx[symbol] = i
+            self._symbols.append(symbol)
+        self._entry[i] = price
+        self._qty[i] = quantity
+        self._high[i] = price
+        self._time[i] = np.datetime64(datetime.now(), 'ns')
 
     def update_highest_price(self, symbol: str, current_price: float):
-        if symbol in self.positions and current_price > self.positions[symbol]["highest_price"]:
-            self.positions[symbol]["highest_price"] = current_price
+        i = self._idx.get(symbol)
+        if i is not None and current_price > self._high[i]:
+            self._high[i] = current_price
+
+    def bulk_update_highest(self, prices: Dict[str, float]):
+        """Raise the highest seen price of every held symbol in prices in one pass"""
+        symbols = [symbol for symbol in prices if symbol in self._idx]
+        if not symbols:
+            return
+        idx = np.fromiter((self._idx[s] for s in symbols), dtype=np.int64, count=len(symbols))
+        current = np.fromiter((prices[s] for s in symbols), dtype=np.float64, count=len(symbols))
+        np.maximum.at(self._high, idx, current)
 
     def should_take_profit(self, symbol: str, current_price: float, profit_threshold: float) -> bool:
-        entry_price = self.positions[symbol]["entry_price"]
+        entry_price = self._entry[self._idx[symbol]]
         return current_price >= entry_price * (1 + profit_threshold)
 
     def should_stop_loss(self, symbol: str, current_price: float, stop_loss_threshold: float) -> bool:
-        entry_price = self.positions[symbol]["entry_price"]
+        entry_price = self._entry[self._idx[symbol]]
         return current_price <= entry_price * (1 - stop_loss_threshold)
 
     def should_trigger_trailing_stop(self, symbol: str, current_price: float, trailing_stop_pct: float) -> bool:
-        highest_price = self.positions[symbol]["highest_price"]
+        highest_price = self._high[self._idx[symbol]]
         return current_price <= highest_price * (1 - trailing_stop_pct)
 
+    def check_all(self, prices: Dict[str, float], profit_threshold: float,
+                  stop_loss_threshold: float, trailing_stop_pct: float) -> List[Tuple[str, str]]:
+        """Check stop loss, take profit and trailing stop for every held symbol in prices.
+
+        Returns (symbol, reason) pairs for the positions that should be closed.
+        """
+        symbols = [symbol for symbol in prices if symbol in self._idx]
+        if not symbols:
+            return []
+
+        idx = np.fromiter((self._idx[s] for s in symbols), dtype=np.int64, count=len(symbols))
+        current = np.fromiter((prices[s] for s in symbols), dtype=np.float64, count=len(symbols))
+        entry = self._entry[idx]
+
+        stop_loss = current <= entry * (1 - stop_loss_threshold)
+        take_profit = current >= entry * (1 + profit_threshold)
+        trailing_stop = current <= self._high[idx] * (1 - trailing_stop_pct)
+
+        exits = []
+        for j in np.flatnonzero(stop_loss | take_profit | trailing_stop):
+            if stop_loss[j]:
+                reason = "stop_loss"
+            elif take_profit[j]:
+                reason = "take_profit"
+            else:
+                reason = "trailing_stop"
+            exits.append((symbols[j], reason))
+        return exits
+
     def remove_position(self, symbol: str):
-        if symbol in self.positions:
-            del self.positions[symbol]
+        i = self._idx.pop(symbol, None)
+        if i is None:
+            return
+        # Move the last position into the freed slot to keep the columns dense
+        last = len(self._symbols) - 1
+        if i != last:
+            moved = self._symbols[last]
+            self._symbols[i] = moved
+            self._idx[moved] = i
+            self._entry[i] = self._entry[last]
+            self._qty[i] = self._qty[last]
+            self._high[i] = self._high[last]
+            self._time[i] = self._time[last]
+        self._symbols.pop()
 
-    def get_position(self, symbol: str):
-        return self.positions.get(symbol)
+    def get_position(self, symbol: str) -> Optional[Position]:
+        """Read-only snapshot of a position; change it through update_quantity/update_highest_price"""
+        i = self._idx.get(symbol)
+        if i is None:
+            return None
+        return Position(
+            entry_price=float(self._entry[i]),
+            quantity=float(self._qty[i]),
+            entry_time=self._time[i].astype('datetime64[us]').item(),
+            highest_price=float(self._high[i])
+        )
 
     def has_position(self, symbol: str) -> bool:
-        return symbol in self.positions
+        return symbol in self._idx
 
     def update_quantity(self, symbol: str, new_quantity: float):
-        if symbol in self.positions:
-            self.positions[symbol]["quantity"] = new_quantity
+        i = self._idx.get(symbol)
+        if i is not None:
+            self._qty[i] = new_quantity
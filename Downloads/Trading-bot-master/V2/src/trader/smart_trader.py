@@ -11,6 +11,8 @@ from src.utils.helper import (
     process_decision,
 )
 from src.config.settings import Config
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
 
 class SmartTrader:
@@ -27,44 +29,75 @@ class SmartTrader:
         self.stock_symbols = Config.STOCK_SYMBOLS
         self.base_position = Config.BASE_POSITION
         self.interval = Config.CHECK_INTERVAL
+        # Symbols are evaluated concurrently; the lock guards the shared position manager
+        self._pool = ThreadPoolExecutor(max_workers=len(self.symbols))
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
 
     def start(self):
-        while True:
-            for symbol in self.symbols:
-                print(f"\n🔍 Evaluating {symbol}...")
+        # Scan on a fixed cadence: sleep until the next deadline rather than a full
+        # interval after each scan, so slow requests don't push later scans back
+        next_scan = time.monotonic()
+        while not self._stop_event.is_set():
+            evaluations = [e for e in self._pool.map(self._evaluate_symbol, self.symbols) if e]
 
-                prices = get_last_hour_historical(self.stock_symbols, symbol)
-                if len(prices) < 20:
-                    print("Not enough historical data.")
-                    continue
+            # Update peak prices for every evaluated symbol, then act on each symbol
+            with self._lock:
+                for symbol, current_price, _ in evaluations:
+                    self.position_manager.update_peak_price(symbol, current_price)
+            list(self._pool.map(lambda e: self._act_on_symbol(*e), evaluations))
 
-                decision_map = get_trading_action(prices)
-                final_decision = process_decision(decision_map)
-                print(f"🧠 Decision from strategy: {final_decision.upper()}")
+            next_scan += self.interval
+            delay = next_scan - time.monotonic()
+            if delay > 0:
+                print(f"\nWaiting {delay:.1f} seconds...\n")
+                self._stop_event.wait(delay)
+            else:
+                next_scan = time.monotonic()
 
-                current_price = get_current_price(symbol)
-                self.position_manager.update_peak_price(symbol, current_price)
+    def stop(self):
+        """Stop the scan loop after the current pass"""
+        self._stop_event.set()
 
-                if self.position_manager.should_sell(symbol, current_price):
-                    quantity = get_crypto_holdings(symbol)
-                    self.execute_sell(symbol, quantity, reason="Stop condition met")
-                    continue
+    def _evaluate_symbol(self, symbol):
+        print(f"\n🔍 Evaluating {symbol}...")
 
-                if final_decision == "buy" and not self.position_manager.has_position(symbol):
-                    quantity = self.base_position / current_price
-                    self.position_manager.add_position(symbol, current_price, quantity)
-                    place_crypto_order(symbol, "buy", self.base_position)
-                    send_notification(f"[BUY] {symbol} at ${current_price:.2f}")
+        prices = get_last_hour_historical(self.stock_symbols, symbol)
+        if len(prices) < 20:
+            print("Not enough historical data.")
+            return
 
-                elif final_decision == "sell" and self.position_manager.has_position(symbol):
-                    quantity = get_crypto_holdings(symbol)
-                    self.execute_sell(symbol, quantity, reason="Strategy signal")
+        decision_map = get_trading_action(prices)
+        final_decision = process_decision(decision_map)
+        print(f"🧠 Decision from strategy: {final_decision.upper()}")
 
-            print(f"\nWaiting {self.interval} seconds...\n")
-            time.sleep(self.interval)
+        current_price = get_current_price(symbol)
+        return symbol, current_price, final_decision
 
-    def execute_sell(self, symbol, quantity, reason=""):
+    def _act_on_symbol(self, symbol, current_price, final_decision):
+        with self._lock:
+            should_sell = self.position_manager.should_sell(symbol, current_price)
+            has_position = self.position_manager.has_position(symbol)
+
+        if should_sell:
+            quantity = get_crypto_holdings(symbol)
+            self.execute_sell(symbol, quantity, current_price, reason="Stop condition met")
+            return
+
+        if final_decision == "buy" and not has_position:
+            quantity = self.base_position / current_price
+            with self._lock:
+                self.position_manager.add_position(symbol, current_price, quantity)
+            place_crypto_order(symbol, "buy", self.base_position)
+            send_notification(f"[BUY] {symbol} at ${current_price:.2f}")
+
+        elif final_decision == "sell" and has_position:
+            quantity = get_crypto_holdings(symbol)
+            self.execute_sell(symbol, quantity, current_price, reason="Strategy signal")
+
+    def execute_sell(self, symbol, quantity, price, reason=""):
         print(f"💰 Selling {symbol}. Reason: {reason}")
-        self.position_manager.remove_position(symbol)
-        place_crypto_order(symbol, "sell", quantity * get_current_price(symbol))
+        with self._lock:
+            self.position_manager.remove_position(symbol)
+        place_crypto_order(symbol, "sell", quantity * price)
         send_notification(f"[SELL] {symbol} triggered by: {reason}")
@@ -1,5 +1,4 @@
-
-import pandas as pd
+import numpy as np
 from .config import (
     VOLATILITY_THRESHOLD, MAX_TECHNICAL_SIGNAL_SCORE, 
     SENTIMENT_SCORE_NORMALIZER, DEFAULT_POSITION_MULTIPLIER,
@@ -8,8 +7,7 @@ from .config import (
 from ..market_analyzer import MarketAnalyzer
 from ..order_flow_analyzer import OrderFlowAnalyzer
 from ..utils.helper import (
-    make_post_or_get_request, rsi_strategy, macd_strategy,
-    bollinger_bands_strategy, stochastic_oscillator_strategy
+    make_post_or_get_request, combined_signals
 )
 
 class TradeAnalyzer:
@@ -23,40 +21,39 @@ class TradeAnalyzer:
         if not historical or 'historicals' not in historical:
             return False, 0, 1.0
 
-        df = pd.DataFrame(historical['historicals'])
-        df['close_price'] = pd.to_numeric(df['close_price'])
-        prices = df['close_price'].tolist()
+        bars = historical['historicals']
+        prices = np.fromiter((bar['close_price'] for bar in bars), dtype=np.float64, count=len(bars))
+        if prices.size == 0:
+            return False, 0, 1.0
 
-        # Technical indicators
-        signals = [
-            rsi_strategy(prices),
-            macd_strategy(prices),
-            bollinger_bands_strategy(prices),
-            stochastic_oscillator_strategy(prices)
-        ]
+        # Technical indicators (1 = buy, -1 = sell, 0 = hold): RSI, MACD, Bollinger, stochastic
+        signals = combined_signals(prices)
+        volatility = self.market_analyzer.calculate_volatility(prices)
+        price = float(prices[-1])
+
+        # Cheap gates first: skip the sentiment and order flow requests when the
+        # technicals or volatility already rule out a buy
+        buy_signals = sum(1 for s in signals if s == 1)
+        technical_strength = buy_signals / MAX_TECHNICAL_SIGNAL_SCORE
+        if not (technical_strength > 0.5 and volatility < VOLATILITY_THRESHOLD):
+            return False, price, DEFAULT_POSITION_MULTIPLIER
 
         # Market & sentiment
         market_data = self.market_analyzer.get_market_sentiment(symbol)
         sentiment_score = market_data['sentiment']
         risk_level = market_data['risk_level']
-        volatility = self.market_analyzer.calculate_volatility(prices)
         order_flow = self.order_flow_analyzer.analyze_order_flow(symbol)
 
         # Buy decision logic
-        buy_signals = sum(1 for s in signals if s == "buy")
-        technical_strength = buy_signals / MAX_TECHNICAL_SIGNAL_SCORE
         sentiment_factor = (sentiment_score + 2) / SENTIMENT_SCORE_NORMALIZER
         should_buy = (
-            technical_strength > 0.5 and
             sentiment_factor >= 0.5 and
-            volatility < VOLATILITY_THRESHOLD and
             order_flow['sentiment'] > 0.5
         )
 
-        price = float(df['close_price'].iloc[-1])
         base_multiplier = self.market_analyzer.adjust_position_size(
             DEFAULT_POSITION_MULTIPLIER, volatility, risk_level
         )
         position_multiplier = base_multiplier * (ORDER_FLOW_BASELINE + order_flow['strength'])
 
-        return should_buy, price, position_multiplier
\ No newline at end of file
+        return should_buy, price, position_multiplier
@@ -2,21 +2,29 @@
 from .helper import (
     make_post_or_get_request,
     get_current_stock_price,
+    get_current_stock_prices,
     load_account_profile,
     get_open_stock_positions,
     rsi_strategy,
     macd_strategy,
     bollinger_bands_strategy,
-    stochastic_oscillator_strategy
+    stochastic_oscillator_strategy,
+    combined_signals,
+    json_loads,
+    json_dumps
 )
 
 __all__ = [
     'make_post_or_get_request',
     'get_current_stock_price',
+    'get_current_stock_prices',
     'load_account_profile',
     'get_open_stock_positions',
     'rsi_strategy',
     'macd_strategy',
     'bollinger_bands_strategy',
-    'stochastic_oscillator_strategy'
+    'stochastic_oscillator_strategy',
+    'combined_signals',
+    'json_loads',
+    'json_dumps'
 ]
@@ -0,0 +1,9 @@
+"""Numba's njit, or a no-op stand-in when numba isn't installed"""
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Return the function unchanged so the kernels run as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
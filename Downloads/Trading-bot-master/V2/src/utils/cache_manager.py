@@ -1,19 +1,20 @@
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Any, Callable, Dict
 import threading
+import time
 from functools import lru_cache
 
 class CacheManager:
     def __init__(self):
         self._cache = {}
         self._cache_lock = threading.Lock()
+        self._key_locks = {}
         
     def get(self, key: str, ttl_seconds: int = 60) -> Any:
         """Get value from cache if not expired"""
         with self._cache_lock:
             if key in self._cache:
                 value, timestamp = self._cache[key]
-                if datetime.now() - timestamp < timedelta(seconds=ttl_seconds):
+                if time.monotonic() - timestamp < ttl_seconds:
                     return value
                 else:
                     del self._cache[key]
@@ -22,7 +23,26 @@ class CacheManager:
     def set(self, key: str, value: Any):
         """Set value in cache with current timestamp"""
         with self._cache_lock:
-            self._cache[key] = (value, datetime.now())
+            self._cache[key] = (value, time.monotonic())
+            
+    def get_or_set(self, key: str, factory: Callable[[], Any], ttl_seconds: int = 60) -> Any:
+        """Get value from cache, computing and storing it with factory if missing or expired.
+
+        Concurrent misses on the same key share one factory call. A None result is not cached.
+        """
+        value = self.get(key, ttl_seconds)
+        if value is not None:
+            return value
+        with self._cache_lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Per-key lock so slow factories don't block other keys
+        with key_lock:
+            value = self.get(key, ttl_seconds)
+            if value is None:
+                value = factory()
+                if value is not None:
+                    self.set(key, value)
+        return value
             
     def clear(self):
         """Clear all cached values"""
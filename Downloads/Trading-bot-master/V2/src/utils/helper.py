@@ -1,62 +1,142 @@
 """Util for re-usable functions"""
+import asyncio
+import atexit
+from collections import Counter
+import functools
 import json
 import smtplib
+import threading
+import time
 from uuid import uuid4
-import requests
+import httpx
 import numpy as np
 import pandas as pd
+from ._njit import njit
+
+# orjson parses bytes directly and is several times faster than json; fall back if missing
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+_API = "https://api.robinhood.com"
+_NUMMUS = "https://nummus.robinhood.com"
+
+HEADERS = {
+    'accept': '*/*',
+    'accept-language': 'en-US,en;q=0.9',
+    'authorization': '{robinhood_bearer_auth}',
+    'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36',
+    'Content-Type': 'application/json'
+}
+
+_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+
+def _build_client():
+    """HTTP/2 client so requests to the Robinhood hosts share multiplexed connections"""
+    return httpx.Client(
+        http2=True,
+        limits=_LIMITS,
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        headers=HEADERS,
+        # Retry failed connection attempts; transport settings override the client's
+        transport=httpx.HTTPTransport(http2=True, limits=_LIMITS, retries=3))
+
+_CLIENT = _build_client()
+
+def close():
+    """Close pooled HTTP connections"""
+    _CLIENT.close()
+
+# Transient statuses on GETs are retried with exponential backoff. POSTs are sent once:
+# a 502/504 from a gateway doesn't mean an order was rejected, and a re-sent order
+# without a ref_id would be placed twice
+_RETRY_STATUS = frozenset((429, 500, 502, 503, 504))
+_RETRIES = 3
+_BACKOFF = 0.2
 
 def make_post_or_get_request(url, payload=None, post_or_get="GET"):
     """Make post or get request"""
-    headers = {
-        'accept': '*/*',
-        'accept-language': 'en-US,en;q=0.9',
-        'authorization': '{robinhood_bearer_auth}',
-        'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36',
-        'Content-Type': 'application/json'
-    }
-
-    response = requests.request(
-        post_or_get, url, headers=headers, data=payload)
-
-    status_code = 500
-    while status_code >= 300:
-        status_code = response.status_code
-        if status_code != 200:
-            print("response not 200", response.text)
-            return response
-        else:
-            return json.loads(response.text)
-    return
+    response = _CLIENT.request(post_or_get, url, content=payload)
+    retries = _RETRIES if post_or_get == "GET" else 0
+    for attempt in range(retries):
+        if response.status_code not in _RETRY_STATUS:
+            break
+        time.sleep(_BACKOFF * (2 ** attempt))
+        response = _CLIENT.request(post_or_get, url, content=payload)
+
+    if response.status_code >= 300:
+        # Don't decode error pages; callers treat a falsy result as no data
+        print("request failed", response.status_code, url)
+        return None
+    return json_loads(response.content)
+
+@functools.lru_cache(maxsize=1)
+def _currency_pair_ids():
+    """Map of crypto code to currency pair id, fetched once per session"""
+    url = f"{_NUMMUS}/currency_pairs/"
+    response = make_post_or_get_request(url)
+    if not response or 'results' not in response:
+        raise Exception("result not found")
+    return {result['asset_currency']['code']: result['id'] for result in response['results']}
 
+@functools.lru_cache(maxsize=None)
 def get_id(symbol):
     """Get crypto id"""
-    url = "https://nummus.robinhood.com/currency_pairs/"
+    crypto_id = _currency_pair_ids().get(symbol)
+    if crypto_id is None:
+        raise Exception("symbol not found")
+    return crypto_id
+
+def _ttl_cache(ttl):
+    """Cache a function's results per positional args for ttl seconds"""
+    def decorator(func):
+        entries = {}
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            value, expires_at = entries.get(args, (None, 0))
+            now = time.monotonic()
+            if now < expires_at:
+                return value
+            value = func(*args)
+            entries[args] = (value, now + ttl)
+            return value
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
+@_ttl_cache(ttl=0.5)
+def get_quote(symbol):
+    """Get the full crypto quote (mark, ask and bid prices), cached briefly to absorb bursts"""
+    crypto_id = get_id(symbol)
+    url = f"{_API}/marketdata/forex/quotes/?ids={crypto_id}"
     response = make_post_or_get_request(url)
-    if 'results' in response:
-        for result in response['results']:
-            if result['asset_currency']['code'] == symbol:
-                return result['id']
-    else:
-        raise Exception("result not found")
-
-    raise Exception("symbol not found")
+    return response['results'][0]
 
 def get_current_price(symbol, key = 'mark_price'):
     """Get current price"""
-    crypto_id = get_id(symbol)
-    url = f"https://api.robinhood.com/marketdata/forex/quotes/?ids={crypto_id}"
-    response = make_post_or_get_request(url)
-    if len(response['results']) > 1:
-        pass
-    return float(response['results'][0][key])
+    return float(get_quote(symbol)[key])
 
 def get_current_stock_price(symbol):
     """Get current stock price"""
-    url = f"https://api.robinhood.com/quotes/?symbols={symbol}"
+    url = f"{_API}/quotes/?symbols={symbol}"
     response = make_post_or_get_request(url)
-    item = response['results'][0]
+    return _quote_price(response['results'][0])
 
+def get_current_stock_prices(symbols):
+    """Get current prices for several stocks with one quotes request"""
+    url = f"{_API}/quotes/?symbols={','.join(symbols)}"
+    response = make_post_or_get_request(url)
+    # Unknown symbols come back as null entries
+    return {item['symbol']: float(_quote_price(item)) for item in response['results'] if item}
+
+def _quote_price(item):
+    """Latest trade price from a stock quote, preferring extended hours"""
     if item['last_extended_hours_trade_price'] is None:
         return item['last_trade_price']
     else:
@@ -65,30 +145,38 @@ def get_current_stock_price(symbol):
 def get_history(symbol, index_range = 0):
     """Get crypto history price"""
     crypto_id = get_id(symbol)
-    url = f"https://api.robinhood.com/marketdata/forex/historicals/{crypto_id}/?bounds=24_7&interval=5minute&span=day"
+    url = f"{_API}/marketdata/forex/historicals/{crypto_id}/?bounds=24_7&interval=5minute&span=day"
     response = make_post_or_get_request(url)
-    return [float(data_point['close_price']) for data_point in response['data_points'][index_range:]]
+    data_points = response['data_points'][index_range:]
+    return np.fromiter((data_point['close_price'] for data_point in data_points),
+                       dtype=np.float32, count=len(data_points))
 
 
 def get_historical_crypto_data(symbol):
     """Get crypto history price"""
+    return pd.DataFrame({"close_price": get_historical_crypto_array(symbol)})
+
+def get_historical_crypto_array(symbol):
+    """Get crypto history close prices as a float64 array"""
     crypto_id = get_id(symbol)
-    url = f"https://api.robinhood.com/marketdata/forex/historicals/{crypto_id}/?bounds=24_7&interval=5minute&span=day"
+    url = f"{_API}/marketdata/forex/historicals/{crypto_id}/?bounds=24_7&interval=5minute&span=day"
     response = make_post_or_get_request(url)
-    df = pd.DataFrame({"close_price": [float(
-        data_point['close_price']) for data_point in response['data_points']]})
-    df['close_price'] = df['close_price'].astype(float)
-    return df
+    data_points = response['data_points']
+    return np.fromiter((data_point['close_price'] for data_point in data_points),
+                       dtype=np.float64, count=len(data_points))
 
 def get_stock_history(symbol, index_range:int = 0):
     """Get stock history price"""
-    url = f"https://api.robinhood.com/quotes/historicals/?symbols={symbol}&interval=5minute&span=day&bounds=extended"
+    url = f"{_API}/quotes/historicals/?symbols={symbol}&interval=5minute&span=day&bounds=extended"
     response = make_post_or_get_request(url)
-    return [float(data_point['close_price']) for data_point in response['results'][0]['historicals'][index_range:]]
+    data_points = response['results'][0]['historicals'][index_range:]
+    return np.fromiter((data_point['close_price'] for data_point in data_points),
+                       dtype=np.float32, count=len(data_points))
 
+@functools.lru_cache(maxsize=1)
 def get_account_id():
     """Get account id from account info"""
-    url = "https://nummus.robinhood.com/accounts/"
+    url = f"{_NUMMUS}/accounts/"
     response = make_post_or_get_request(url)
     return response['results'][0]['id']
 
@@ -114,7 +202,11 @@ def momentum_strategy(history):
     """Buy if price is increasing steadily, sell if decreasing."""
     if len(history) < 3:
         return "hold"
-    return "buy" if history[-1] > history[-2] > history[-3] else "sell" if history[-1] < history[-2] < history[-3] else "hold"
+    a, b, c = history[-3], history[-2], history[-1]
+    last_move = int(c > b) - int(c < b)
+    prev_move = int(b > a) - int(b < a)
+    # Both moves must agree in direction; anything else holds
+    return ("sell", "hold", "buy")[1 + last_move * (last_move == prev_move)]
 
 def sma_strategy(prices, short_window=10, long_window=50):
     """Simple Moving Average (SMA) Strategy"""
@@ -131,12 +223,15 @@ def sma_strategy(prices, short_window=10, long_window=50):
 
 def rsi_strategy(prices, period=14):
     """Relative Strength Index (RSI) Strategy"""
-    delta = np.diff(prices)
-    gain = np.maximum(delta, 0)
-    loss = np.maximum(-delta, 0)
+    # Only the last `period` price changes matter, so diff just that tail
+    tail = np.asarray(prices[-(period + 1):], dtype=np.float64)
+    if tail.size < 2:
+        return "hold"
+    delta = np.diff(tail)
+    inv_n = 1.0 / delta.size
 
-    avg_gain = np.mean(gain[-period:])
-    avg_loss = np.mean(loss[-period:])
+    avg_gain = np.add.reduce(np.clip(delta, 0, None)) * inv_n
+    avg_loss = np.add.reduce(np.clip(-delta, 0, None)) * inv_n
 
     rs = avg_gain / (avg_loss + 1e-10)
     rsi = 100 - (100 / (1 + rs))
@@ -164,13 +259,16 @@ def bollinger_bands_strategy(history, period=20):
     if len(history) < period:
         return "hold"
 
-    sma = sum(history[-period:]) / period
-    std_dev = (sum((p - sma) ** 2 for p in history[-period:]) / period) ** 0.5
+    tail = np.asarray(history[-period:], dtype=np.float32)
+    sma = tail.mean()
+    std_dev = tail.std()
 
     lower_band = sma - (2 * std_dev)
     upper_band = sma + (2 * std_dev)
 
-    return "buy" if history[-1] <= lower_band else "sell" if history[-1] >= upper_band else "hold"
+    # buy at or below the lower band, otherwise sell at or above the upper band
+    last = tail[-1]
+    return ("buy", "hold", "sell")[(1 + int(last >= upper_band)) * int(last > lower_band)]
 
 def stochastic_oscillator_strategy(history, period=14):
     """Buy if %K crosses above %D in oversold region, sell in overbought."""
@@ -183,51 +281,178 @@ def stochastic_oscillator_strategy(history, period=14):
 
     percent_k = 100 * (current_close - lowest_low) / (highest_high - lowest_low) if highest_high != lowest_low else 50
 
-    return "buy" if percent_k < 20 else "sell" if percent_k > 80 else "hold"
+    return ("buy", "hold", "sell")[int(percent_k >= 20) + int(percent_k > 80)]
+
+# Array kernel for the technical strategies above. It takes a float64 ndarray and
+# returns 1 to buy, -1 to sell and 0 to hold per indicator, so callers can skip list
+# conversions. The explicit signature compiles it at import and cache=True keeps the
+# machine code in __pycache__, so the first trading tick doesn't pay for JIT compilation.
+
+@njit('UniTuple(int8, 4)(float64[:])', cache=True, fastmath=True)
+def combined_signals(prices):
+    """RSI, MACD, Bollinger and stochastic signals in one pass over the last 26 bars.
+
+    Returns (rsi, macd, bollinger, stochastic) codes using the same windows as
+    rsi_strategy, macd_strategy, bollinger_bands_strategy and stochastic_oscillator_strategy.
+    """
+    n = prices.shape[0]
+    rsi_start = max(1, n - 14)
+    bb_start = n - 20
+    stoch_start = n - 14
+    gain = 0.0
+    loss = 0.0
+    sum_9 = 0.0
+    sum_12 = 0.0
+    sum_26 = 0.0
+    bb_mean = 0.0
+    bb_m2 = 0.0
+    highest_high = -np.inf
+    lowest_low = np.inf
+    for i in range(max(0, n - 26), n):
+        price = prices[i]
+        if i >= rsi_start:
+            delta = price - prices[i - 1]
+            if delta > 0:
+                gain += delta
+            else:
+                loss -= delta
+        sum_26 += price
+        if i >= n - 12:
+            sum_12 += price
+        if i >= n - 9:
+            sum_9 += price
+        if i >= bb_start:
+            delta = price - bb_mean
+            bb_mean += delta / (i - bb_start + 1)
+            bb_m2 += (price - bb_mean) * delta
+        if i >= stoch_start:
+            if price > highest_high:
+                highest_high = price
+            if price < lowest_low:
+                lowest_low = price
+
+    last = prices[n - 1] if n > 0 else 0.0
+
+    rsi_sig = 0
+    if n >= 2:
+        count = n - rsi_start
+        rs = (gain / count) / (loss / count + 1e-10)
+        rsi = 100 - (100 / (1 + rs))
+        if rsi < 30:
+            rsi_sig = 1
+        elif rsi > 70:
+            rsi_sig = -1
+
+    macd_sig = 0
+    if n >= 26:
+        macd = sum_12 / 12 - sum_26 / 26
+        signal = sum_9 / 9
+        if macd > signal:
+            macd_sig = 1
+        elif macd < signal:
+            macd_sig = -1
+
+    bb_sig = 0
+    if n >= 20:
+        std_dev = (bb_m2 / 20) ** 0.5
+        if last <= bb_mean - 2 * std_dev:
+            bb_sig = 1
+        elif last >= bb_mean + 2 * std_dev:
+            bb_sig = -1
+
+    stoch_sig = 0
+    if n >= 14:
+        if highest_high != lowest_low:
+            percent_k = 100 * (last - lowest_low) / (highest_high - lowest_low)
+        else:
+            percent_k = 50.0
+        if percent_k < 20:
+            stoch_sig = 1
+        elif percent_k > 80:
+            stoch_sig = -1
+
+    return rsi_sig, macd_sig, bb_sig, stoch_sig
+
+def _compare_signal(value, reference):
+    return "buy" if value > reference else "sell" if value < reference else "hold"
 
 def get_trading_action(prices):
-    """Determine buy/sell decision based on majority vote"""
-    strategies = [
-        sma_strategy,
-        rsi_strategy,
-        momentum_strategy,
-        macd_strategy
-    ]
-    strategy_result = {}
-    for strategy in strategies:
-        action = strategy(prices)
-        strategy_result[strategy.__name__] = action
+    """Determine buy/sell decision based on majority vote.
+
+    Computes the sma, rsi, momentum and macd strategies from one array conversion,
+    sharing the trailing window sums between the SMA and MACD signals.
+    """
+    a = np.asarray(prices, dtype=np.float64)
+    n = a.size
+
+    # tail_sums[k - 1] is the sum of the last k prices
+    tail_sums = np.cumsum(a[:-51:-1])
+
+    def sma(window):
+        window = min(window, n)
+        return tail_sums[window - 1] / window
+
+    if n < 26:
+        macd = "hold"
+    else:
+        macd = _compare_signal(sma(12) - sma(26), sma(9))
+
+    strategy_result = {
+        'sma_strategy': _compare_signal(sma(10), sma(50)),
+        'rsi_strategy': rsi_strategy(a),
+        'momentum_strategy': momentum_strategy(a),
+        'macd_strategy': macd
+    }
     return strategy_result  # Return action with most votes
 
 def process_decision(strategy_result):
-    buy_signals = sum(1 for decision in strategy_result.values() if "buy" in decision)
-    sell_signals = sum(1 for decision in strategy_result.values() if "sell" in decision)
-    hold_signals = sum(1 for decision in strategy_result.values() if "hold" in decision)
+    """Return the action with a strict majority of votes, holding on ties"""
+    counts = Counter(strategy_result.values())
+    buy_signals, sell_signals, hold_signals = counts["buy"], counts["sell"], counts["hold"]
+    return "buy" if buy_signals > max(sell_signals, hold_signals) else \
+        "sell" if sell_signals > max(buy_signals, hold_signals) else "hold"
 
-    if hold_signals > sell_signals and hold_signals > buy_signals:
-        return "hold"
+_smtp = None
+_smtp_lock = threading.Lock()
 
-    if buy_signals > sell_signals and buy_signals > hold_signals:
-        return "buy"
-    elif sell_signals > buy_signals and sell_signals > hold_signals:
-        if hold_signals == sell_signals:
-            return "hold"
-        else:
-            return "sell"
-    else:
-        return "hold"
+def _get_smtp():
+    """Return the shared SMTP connection, reconnecting if the server dropped it.
+
+    Callers must hold _smtp_lock.
+    """
+    global _smtp
+    if _smtp is not None:
+        try:
+            _smtp.noop()
+            return _smtp
+        except OSError:
+            # SMTPServerDisconnected and socket errors both mean a stale connection
+            _smtp = None
+    smtp = smtplib.SMTP('smtp.gmail.com', 587)
+    smtp.starttls()
+    smtp.login("{email_address}", "{app_password}")
+    _smtp = smtp
+    return smtp
+
+def _close_smtp():
+    """Quit the shared SMTP connection at interpreter exit"""
+    with _smtp_lock:
+        if _smtp is not None:
+            try:
+                _smtp.quit()
+            except OSError:
+                pass
+
+atexit.register(_close_smtp)
 
 def send_notification(message, should_send_email=False):
     """Sending email"""
     if should_send_email:
-        s = smtplib.SMTP('smtp.gmail.com', 587)
-        s.starttls()
-        s.login("{email_address}", "{app_password}")
-        s.sendmail("{email_from}", "{email_to}", f"{message}")
-        s.quit()
+        with _smtp_lock:
+            _get_smtp().sendmail("{email_from}", "{email_to}", f"{message}")
     else:
         url = "https://api.pushcut.io/{push_cut_key}/notifications/Crypto"
-        payload = json.dumps({
+        payload = json_dumps({
             "input": "",
             "text": f"{message}",
             "title": f"{message}"
@@ -240,29 +465,46 @@ class RiskManager:
         self.stop_loss_pct = stop_loss_pct / 100
         self.take_profit_pct = take_profit_pct / 100
         self.trailing_stop_pct = trailing_stop_pct / 100
-        self.entry_price = None
-        self.highest_price = None
+        self._trail_mult = 1 - self.trailing_stop_pct
+        self.set_entry(None)
+
+    @property
+    def entry_price(self):
+        return self._entry_price
+
+    @entry_price.setter
+    def entry_price(self, price):
+        self.set_entry(price)
+
+    def set_entry(self, price):
+        """Record the entry price and precompute the exit thresholds for it"""
+        self._entry_price = price
+        self.highest_price = price
+        if price is None:
+            return
+        self._stop = price * (1 - self.stop_loss_pct)
+        self._take = price * (1 + self.take_profit_pct)
+        self._trail = price * self._trail_mult
 
     def should_exit_trade(self, current_price):
         """Exit Strategy"""
-        if self.entry_price is None:
+        if self._entry_price is None:
             return False
 
-        if current_price <= self.entry_price * (1 - self.stop_loss_pct):
-            return "sell"
-        if current_price >= self.entry_price * (1 + self.take_profit_pct):
-            return "sell"
-        if self.highest_price and current_price <= self.highest_price * (1 - self.trailing_stop_pct):
+        if current_price <= self._stop or current_price >= self._take or current_price <= self._trail:
             return "sell"
 
-        self.highest_price = max(self.highest_price or self.entry_price, current_price)
+        if current_price > self.highest_price:
+            self.highest_price = current_price
+            self._trail = current_price * self._trail_mult
         return False
 
 def place_crypto_order(symbol, side, buying_or_selling_price, order_type="market"):
     """Buy or sell crypto"""
     # side is buy or sell
-    current_ask_price = get_current_price(symbol, 'ask_price')
-    current_bid_price = get_current_price(symbol, 'bid_price')
+    quote = get_quote(symbol)
+    current_ask_price = float(quote['ask_price'])
+    current_bid_price = float(quote['bid_price'])
 
     if side == 'buy':
         price = current_ask_price #has to be 1% increase of the price to buy and 5% decrease of the price to sell
@@ -275,7 +517,7 @@ def place_crypto_order(symbol, side, buying_or_selling_price, order_type="market
     quantity = round_price(buying_or_selling_price/price)
     time_in_force = "gtc"
 
-    url = "https://nummus.robinhood.com/orders/"
+    url = f"{_NUMMUS}/orders/"
     data = {
         "account_id": f"{account_id}",
         "currency_pair_id": f"{crypto_id}",
@@ -293,30 +535,33 @@ def place_crypto_order(symbol, side, buying_or_selling_price, order_type="market
     # if order_type == "market":
     #     data["entered_amount"] = f"{buying_or_selling_price}"
 
-    payload = json.dumps(data)
+    payload = json_dumps(data)
 
     return make_post_or_get_request(url, payload, "POST")
 
 def calculate_trend(symbol):
-    df = get_historical_crypto_data(symbol)
-    df["SMA_20"] = df["close_price"].rolling(window=20).mean()
-    df["Momentum"] = df["close_price"].diff()
-    
-    if df["Momentum"].iloc[-1] > 0 and df["close_price"].iloc[-1] > df["SMA_20"].iloc[-1]:
+    prices = get_historical_crypto_array(symbol)
+    if len(prices) < 2:
+        return "hold"
+    momentum = prices[-1] - prices[-2]
+    # The 20 bar SMA only exists once there are 20 bars
+    above_sma = len(prices) >= 20 and prices[-1] > prices[-20:].mean()
+
+    if momentum > 0 and above_sma:
         return "buy"
-    elif df["Momentum"].iloc[-1] < 0:
+    elif momentum < 0:
         return "sell"
     return "hold"
 
 def load_portfolio_profile():
     """Load portfolio profile to get equity balance"""
-    url = "https://api.robinhood.com/portfolios/"
+    url = f"{_API}/portfolios/"
     response = make_post_or_get_request(url)
     return response['results'][0]
 
 def load_account_profile():
     """Load account profile to get equity balance"""
-    url = "https://api.robinhood.com/accounts/?default_to_all_accounts=true"
+    url = f"{_API}/accounts/?default_to_all_accounts=true"
     response = make_post_or_get_request(url)
     return response['results']
 
@@ -328,12 +573,12 @@ def get_last_hour_historical(stock_symbols, symbol, last_hour=-12):
         return get_history(symbol, index_range=last_hour)
 
 def get_open_stock_positions():
-    url = "https://api.robinhood.com/positions/?nonzero=true"
+    url = f"{_API}/positions/?nonzero=true"
     response = make_post_or_get_request(url)
     return response['results']
 
 def get_crypto_holdings(symbol, key = 'quantity_available'):
-    url = "https://nummus.robinhood.com/holdings/"
+    url = f"{_NUMMUS}/holdings/"
     response = make_post_or_get_request(url)
     for item in response['results']:
         if item['currency']['code'] == symbol:
@@ -341,6 +586,28 @@ def get_crypto_holdings(symbol, key = 'quantity_available'):
 
 
 
+async def _fetch_json(client, url):
+    """Async GET returning the parsed JSON body, or None if the status is not 200"""
+    response = await client.get(url)
+    if response.status_code != 200:
+        return None
+    return json_loads(response.content)
+
+async def _fetch_position_data(client, semaphore, item):
+    """Instrument data and current price for one position"""
+    async with semaphore:
+        instrument_data = await _fetch_json(client, item['instrument'])
+        quote = await _fetch_json(client, f"{_API}/quotes/?symbols={instrument_data['symbol']}")
+    return instrument_data, _quote_price(quote['results'][0])
+
+async def _fetch_holdings_data(positions_data):
+    """Fetch instrument data and prices for all positions concurrently"""
+    async with httpx.AsyncClient(http2=True, limits=_LIMITS, timeout=10.0, headers=HEADERS) as client:
+        semaphore = asyncio.Semaphore(8)
+        return await asyncio.gather(
+            *(_fetch_position_data(client, semaphore, item) for item in positions_data),
+            return_exceptions=True)
+
 def build_holdings():
     """Builds a dictionary of important information regarding the stocks and positions owned by the user.
 
@@ -371,18 +638,19 @@ def build_holdings():
     cash = "{0:.2f}".format(
         float(accounts_data['cash']) + float(accounts_data['uncleared_deposits']))
 
-    holdings = {}
-    for item in positions_data:
-        # It is possible for positions_data to be [None]
-        if not item:
-            continue
+    # It is possible for positions_data to be [None]
+    positions_data = [item for item in positions_data if item]
+    position_results = asyncio.run(_fetch_holdings_data(positions_data))
 
+    holdings = {}
+    for item, result in zip(positions_data, position_results):
         try:
-            instrument_data = make_post_or_get_request(item['instrument'])
+            if isinstance(result, Exception):
+                raise result
+            instrument_data, price = result
             symbol = instrument_data['symbol']
             # fundamental_data = get_fundamentals(symbol)[0]
 
-            price = get_current_stock_price(symbol)[0]
             quantity = item['quantity']
             equity = float(item['quantity']) * float(price)
             equity_change = (float(quantity) * float(price)) - \
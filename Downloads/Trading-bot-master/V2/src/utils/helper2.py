@@ -1,52 +1,100 @@
+import atexit
+from collections import Counter
+import functools
 import json
 import smtplib
+import threading
+import time
 from uuid import uuid4
-import requests
+import httpx
 import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+_API = "https://api.robinhood.com"
+_NUMMUS = "https://nummus.robinhood.com"
+
+HEADERS = {
+    'accept': '*/*',
+    'accept-language': 'en-US,en;q=0.9',
+    'authorization': '{robinhood_bearer_auth}',
+    'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36',
+    'Content-Type': 'application/json'
+}
+
+# Only GETs are retried on these statuses; re-sending an order POST could place it twice
+_RETRY_STATUS = frozenset((429, 500, 502, 503, 504))
+_RETRIES = 3
+_BACKOFF = 0.2
+
+_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+
+def _build_client():
+    return httpx.Client(
+        http2=True,
+        limits=_LIMITS,
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        headers=HEADERS,
+        transport=httpx.HTTPTransport(http2=True, limits=_LIMITS, retries=3))
+
 class Helper:
+    # Shared HTTP/2 client so requests multiplex over connections to the Robinhood hosts
+    session = _build_client()
+    _smtp = None
+    _smtp_lock = threading.Lock()
+
+    @staticmethod
+    def close():
+        Helper.session.close()
+
     @staticmethod
     def make_post_or_get_request(url, payload=None, post_or_get="GET"):
-        headers = {
-            'accept': '*/*',
-            'accept-language': 'en-US,en;q=0.9',
-            'authorization': '{robinhood_bearer_auth}',
-            'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36',
-            'Content-Type': 'application/json'
-        }
-
-        response = requests.request(post_or_get, url, headers=headers, data=payload)
-        status_code = 500
-        while status_code >= 300:
-            status_code = response.status_code
-            if status_code != 200:
-                print("response not 200", response.text)
-                return response
-            else:
-                return json.loads(response.text)
-        return
+        response = Helper.session.request(post_or_get, url, content=payload)
+        retries = _RETRIES if post_or_get == "GET" else 0
+        for attempt in range(retries):
+            if response.status_code not in _RETRY_STATUS:
+                break
+            time.sleep(_BACKOFF * (2 ** attempt))
+            response = Helper.session.request(post_or_get, url, content=payload)
+        if response.status_code >= 300:
+            # Callers treat a falsy result as no data
+            return None
+        return _json_loads(response.content)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _currency_pair_ids():
+        url = f"{_NUMMUS}/currency_pairs/"
+        response = Helper.make_post_or_get_request(url)
+        if not response or 'results' not in response:
+            raise Exception("symbol not found")
+        return {result['asset_currency']['code']: result['id'] for result in response['results']}
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_id(symbol):
-        url = "https://nummus.robinhood.com/currency_pairs/"
-        response = Helper.make_post_or_get_request(url)
-        if 'results' in response:
-            for result in response['results']:
-                if result['asset_currency']['code'] == symbol:
-                    return result['id']
-        raise Exception("symbol not found")
+        crypto_id = Helper._currency_pair_ids().get(symbol)
+        if crypto_id is None:
+            raise Exception("symbol not found")
+        return crypto_id
 
     @staticmethod
     def get_current_price(symbol, key='mark_price'):
         crypto_id = Helper.get_id(symbol)
-        url = f"https://api.robinhood.com/marketdata/forex/quotes/?ids={crypto_id}"
+        url = f"{_API}/marketdata/forex/quotes/?ids={crypto_id}"
         response = Helper.make_post_or_get_request(url)
         return float(response['results'][0][key])
 
     @staticmethod
     def get_current_stock_price(symbol):
-        url = f"https://api.robinhood.com/quotes/?symbols={symbol}"
+        url = f"{_API}/quotes/?symbols={symbol}"
         response = Helper.make_post_or_get_request(url)
         item = response['results'][0]
         return item['last_extended_hours_trade_price'] or item['last_trade_price']
@@ -54,18 +102,21 @@ class Helper:
     @staticmethod
     def get_history(symbol, index_range=0):
         crypto_id = Helper.get_id(symbol)
-        url = f"https://api.robinhood.com/marketdata/forex/historicals/{crypto_id}/?bounds=24_7&interval=5minute&span=day"
+        url = f"{_API}/marketdata/forex/historicals/{crypto_id}/?bounds=24_7&interval=5minute&span=day"
         response = Helper.make_post_or_get_request(url)
-        return [float(datapoint['close_price']) for datapoint in response['data_points'][index_range:]]
+        datapoints = response['data_points'][index_range:]
+        return np.fromiter((datapoint['close_price'] for datapoint in datapoints),
+                           dtype=np.float32, count=len(datapoints))
 
     @staticmethod
     def get_historical_crypto_data(symbol):
         crypto_id = Helper.get_id(symbol)
-        url = f"https://api.robinhood.com/marketdata/forex/historicals/{crypto_id}/?bounds=24_7&interval=5minute&span=day"
+        url = f"{_API}/marketdata/forex/historicals/{crypto_id}/?bounds=24_7&interval=5minute&span=day"
         response = Helper.make_post_or_get_request(url)
-        df = pd.DataFrame({"close_price": [float(datapoint['close_price']) for datapoint in response['data_points']]})
-        df['close_price'] = df['close_price'].astype(float)
-        return df
+        datapoints = response['data_points']
+        close_prices = np.fromiter((datapoint['close_price'] for datapoint in datapoints),
+                                   dtype=np.float64, count=len(datapoints))
+        return pd.DataFrame({"close_price": close_prices})
 
     @staticmethod
     def round_price(price):
@@ -81,7 +132,10 @@ class Helper:
     def momentum_strategy(history):
         if len(history) < 3:
             return "hold"
-        return "buy" if history[-1] > history[-2] > history[-3] else "sell" if history[-1] < history[-2] < history[-3] else "hold"
+        a, b, c = history[-3], history[-2], history[-1]
+        last_move = int(c > b) - int(c < b)
+        prev_move = int(b > a) - int(b < a)
+        return ("sell", "hold", "buy")[1 + last_move * (last_move == prev_move)]
 
     @staticmethod
     def sma_strategy(prices, short_window=10, long_window=50):
@@ -92,11 +146,14 @@ class Helper:
     @staticmethod
     def rsi_strategy(prices, period=14):
         """Relative Strength Index (RSI) Strategy"""
-        delta = np.diff(prices)
-        gain = np.maximum(delta, 0)
-        loss = np.maximum(-delta, 0)
-        avg_gain = np.mean(gain[-period:])
-        avg_loss = np.mean(loss[-period:])
+        # Only the last `period` price changes matter, so diff just that tail
+        tail = np.asarray(prices[-(period + 1):], dtype=np.float64)
+        if tail.size < 2:
+            return "hold"
+        delta = np.diff(tail)
+        inv_n = 1.0 / delta.size
+        avg_gain = np.add.reduce(np.clip(delta, 0, None)) * inv_n
+        avg_loss = np.add.reduce(np.clip(-delta, 0, None)) * inv_n
         rs = avg_gain / (avg_loss + 1e-10)
         rsi = 100 - (100 / (1 + rs))
         return "buy" if rsi < 30 else "sell" if rsi > 70 else "hold"
@@ -117,11 +174,13 @@ class Helper:
         """Buy when price is near the lower band, sell near the upper band."""
         if len(history) < period:
             return "hold"
-        sma = np.mean(history[-period:])
-        std_dev = np.std(history[-period:])
+        tail = np.asarray(history[-period:], dtype=np.float32)
+        sma = tail.mean()
+        std_dev = tail.std()
         lower_band = sma - (2 * std_dev)
         upper_band = sma + (2 * std_dev)
-        return "buy" if history[-1] <= lower_band else "sell" if history[-1] >= upper_band else "hold"
+        last = tail[-1]
+        return ("buy", "hold", "sell")[(1 + int(last >= upper_band)) * int(last > lower_band)]
 
     @staticmethod
     def stochastic_oscillator_strategy(history, period=14):
@@ -131,7 +190,7 @@ class Helper:
         low = min(history[-period:])
         close = history[-1]
         percent_k = 100 * (close - low) / (high - low) if high != low else 50
-        return "buy" if percent_k < 20 else "sell" if percent_k > 80 else "hold"
+        return ("buy", "hold", "sell")[int(percent_k >= 20) + int(percent_k > 80)]
 
     @staticmethod
     def get_trading_action(prices):
@@ -146,20 +205,43 @@ class Helper:
 
     @staticmethod
     def process_decision(strategy_result):
-        buy = sum(1 for val in strategy_result.values() if val == "buy")
-        sell = sum(1 for val in strategy_result.values() if val == "sell")
-        hold = sum(1 for val in strategy_result.values() if val == "hold")
+        counts = Counter(strategy_result.values())
+        buy, sell, hold = counts["buy"], counts["sell"], counts["hold"]
         return "buy" if buy > max(sell, hold) else "sell" if sell > max(buy, hold) else "hold"
 
+    @staticmethod
+    def _get_smtp():
+        # Reuse one logged-in SMTP connection; callers hold Helper._smtp_lock
+        if Helper._smtp is not None:
+            try:
+                Helper._smtp.noop()
+                return Helper._smtp
+            except OSError:
+                Helper._smtp = None
+        smtp = smtplib.SMTP('smtp.gmail.com', 587)
+        smtp.starttls()
+        smtp.login("{email_address}", "{app_password}")
+        Helper._smtp = smtp
+        return smtp
+
+    @staticmethod
+    def _close_smtp():
+        with Helper._smtp_lock:
+            if Helper._smtp is not None:
+                try:
+                    Helper._smtp.quit()
+                except OSError:
+                    pass
+
     @staticmethod
     def send_notification(message, send_email=False):
         if send_email:
-            s = smtplib.SMTP('smtp.gmail.com', 587)
-            s.starttls()
-            s.login("{email_address}", "{app_password}")
-            s.sendmail("{email_from}", "{email_to}", f"{message}")
-            s.quit()
+            with Helper._smtp_lock:
+                Helper._get_smtp().sendmail("{email_from}", "{email_to}", f"{message}")
         else:
             url = "https://api.pushcut.io/{push_cut_key}/notifications/Crypto"
-            payload = json.dumps({"input": "", "text": f"{message}", "title": f"{message}"})
+            payload = _json_dumps({"input": "", "text": f"{message}", "title": f"{message}"})
             Helper.make_post_or_get_request(url, payload, "POST")
+
+
+atexit.register(Helper._close_smtp)
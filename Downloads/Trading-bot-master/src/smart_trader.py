@@ -1,18 +1,41 @@
-import pandas as pd
+import logging
+import numpy as np
+import queue
+import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, time as dt_time
 import os
 from typing import Dict, List, Tuple
 from zoneinfo import ZoneInfo
-from .utils.helper import (make_post_or_get_request, get_current_stock_price, 
+from .utils.helper import (make_post_or_get_request, get_current_stock_prices, 
                          load_account_profile, get_open_stock_positions, 
-                         rsi_strategy, macd_strategy, bollinger_bands_strategy,
-                         stochastic_oscillator_strategy, send_notification)
-from .market_analyzer import MarketAnalyzer
+                         combined_signals, send_notification, close,
+                         json_dumps)
+from .market_analyzer import MarketAnalyzer, RISK_FACTOR
 from .order_flow_analyzer import OrderFlowAnalyzer
 from .cache_manager import cache
-import json
-from functools import lru_cache
+
+log = logging.getLogger(__name__)
+
+_HIST_URL = "https://api.robinhood.com/marketdata/historicals/{}/?interval=5minute&span=day".format
+
+# Fields shared by every market order; orders add account, instrument, symbol, quantity and side
+_ORDER_TEMPLATE = {"type": "market", "time_in_force": "gtc", "trigger": "immediate"}
+
+# Regular trading hours (9:30 AM - 4:00 PM ET)
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+NY_TZ = ZoneInfo('America/New_York')
+TICK_SECONDS = 5
+MIN_BARS = 26  # Longest indicator window (the 26 bar MACD mean) in combined_signals
+
+def _seconds_until_open(now: datetime) -> float:
+    """Seconds from now (New York time) until the next market open"""
+    next_open = datetime.combine(now.date(), MARKET_OPEN, tzinfo=NY_TZ)
+    if now.time() > MARKET_CLOSE:
+        next_open += timedelta(days=1)
+    return (next_open - now).total_seconds()
 
 class SmartTrader:
     def __init__(self):
@@ -26,10 +49,29 @@ class SmartTrader:
         self.market_analyzer = MarketAnalyzer()
         self.order_flow_analyzer = OrderFlowAnalyzer()
         self.volatility_threshold = 0.02  # 2% volatility threshold
+        self._pool = ThreadPoolExecutor(max_workers=8)  # Overlaps the per-symbol HTTP waits
+        self._account_number = None
+        # Notifications are sent from a background thread so they never delay an order
+        self._notif_q = queue.Queue()
+        threading.Thread(target=self._notif_worker, daemon=True).start()
+        self._instr = "https://api.robinhood.com/instruments/{}/".format
 
+    def _notif_worker(self):
+        """Send queued notifications one at a time"""
+        while True:
+            message = self._notif_q.get()
+            try:
+                send_notification(message)
+            except Exception as e:
+                log.error("Error sending notification %r: %s", message, e)
 
+    @property
+    def account_number(self) -> str:
+        """Account number, fetched once on first use"""
+        if self._account_number is None:
+            self._account_number = load_account_profile()[0]['account_number']
+        return self._account_number
 
-    @lru_cache(maxsize=1)
     def get_buying_power(self) -> float:
         """Get available buying power with 1-second cache"""
         try:
@@ -42,7 +84,7 @@ class SmartTrader:
             cache.set('buying_power', power)
             return power
         except Exception as e:
-            print(f"Error getting buying power: {str(e)}")
+            log.error("Error getting buying power: %s", e)
             return 0.0
 
     def analyze_stock(self, symbol: str) -> Tuple[bool, float, float]:
@@ -52,41 +94,35 @@ class SmartTrader:
         """
         try:
             # Get historical data
-            url = f"https://api.robinhood.com/marketdata/historicals/{symbol}/?interval=5minute&span=day"
-            historical = make_post_or_get_request(url)
+            historical = make_post_or_get_request(_HIST_URL(symbol))
             if not historical or 'historicals' not in historical:
                 return False, 0, 1.0
 
-            df = pd.DataFrame(historical['historicals'])
-            df['close_price'] = pd.to_numeric(df['close_price'])
-            prices = df['close_price'].tolist()
+            bars = historical['historicals']
+            if len(bars) < MIN_BARS:
+                return False, 0, 1.0
+            prices = np.fromiter((bar['close_price'] for bar in bars), dtype=np.float64, count=len(bars))
             
-            # Calculate technical indicators
-            rsi_signal = rsi_strategy(prices)
-            macd_signal = macd_strategy(prices)
-            bb_signal = bollinger_bands_strategy(prices)
-            stoch_signal = stochastic_oscillator_strategy(prices)
+            # Calculate technical indicators (1 = buy, -1 = sell, 0 = hold)
+            rsi_sig, macd_sig, bb_sig, stoch_sig = combined_signals(prices)
             
             # Get market sentiment using BLS data
-            market_data = self.market_analyzer.get_market_sentiment(symbol)
+            market_data = cache.get_or_set(
+                f"sent:{symbol}", lambda: self.market_analyzer.get_market_sentiment(symbol), ttl_seconds=60)
             sentiment_score = market_data['sentiment']  # Already adjusted for sector
             risk_level = market_data['risk_level']
             
             # Log economic conditions
-            if 'economic_data' in market_data:
-                print(f"Economic indicators for {symbol} ({market_data['sector']}):\n" + 
-                      "\n".join([f"{k}: {v['latest']} (change: {v['change']:.2f}%)" 
-                                 for k, v in market_data['economic_data'].items()]))
+            if 'economic_data' in market_data and log.isEnabledFor(logging.DEBUG):
+                log.debug("Economic indicators for %s (%s): %s",
+                          symbol, market_data['sector'], market_data['economic_data'])
             
             # Calculate volatility
             volatility = self.market_analyzer.calculate_volatility(prices)
             
-            # Count buy signals
-            buy_signals = sum(1 for signal in [rsi_signal, macd_signal, bb_signal, stoch_signal] 
-                             if signal == "buy")
-            
             # Determine if we should buy based on multiple factors
-            technical_strength = buy_signals / 4  # Percentage of buy signals
+            # Share of buy signals; sell (-1) and hold (0) both count as zero
+            technical_strength = 0.25 * ((rsi_sig > 0) + (macd_sig > 0) + (bb_sig > 0) + (stoch_sig > 0))
             sentiment_factor = (sentiment_score + 2) / 4  # Normalize to 0-1 range
             
             # Get order flow analysis
@@ -98,39 +134,37 @@ class SmartTrader:
                         volatility < self.volatility_threshold and
                         order_flow['sentiment'] > 0.5)
             
-            current_price = float(df['close_price'].iloc[-1])
+            current_price = float(prices[-1])
             
             # Calculate position size multiplier based on market conditions and order flow
-            base_multiplier = self.market_analyzer.adjust_position_size(
-                base_position=1.0,
-                volatility=volatility,
-                risk_level=risk_level
-            )
-            
-            # Further adjust position size based on order flow strength
-            order_flow_multiplier = order_flow['strength']  # 0 to 1
-            position_multiplier = base_multiplier * (0.5 + order_flow_multiplier)  # Adjust by ±50% based on order flow
+            position_multiplier = self._fast_position(volatility, risk_level, order_flow['strength'])
             
             return should_buy, current_price, position_multiplier
         except Exception as e:
-            print(f"Error analyzing {symbol}: {str(e)}")
-            return False, 0
+            log.error("Error analyzing %s: %s", symbol, e)
+            return False, 0, 1.0
+
+    @staticmethod
+    def _fast_position(volatility: float, risk_level: str, of_strength: float) -> float:
+        """MarketAnalyzer.adjust_position_size for a base position of 1.0, scaled by order flow.
+
+        of_strength (0 to 1) adjusts the size by ±50%.
+        """
+        volatility_factor = 1 - (volatility * 2)  # Reduce position size as volatility increases
+        return max(0.2, volatility_factor * RISK_FACTOR[risk_level]) * (0.5 + of_strength)
 
     def place_buy_order(self, symbol: str, price: float, quantity: int):
         """Place a buy order with stop loss and take profit"""
         try:
             # Place buy order
             url = "https://api.robinhood.com/orders/"
-            payload = json.dumps({
-                "account": load_account_profile()['account_number'],
-                "instrument": f"https://api.robinhood.com/instruments/{symbol}/",
+            common = {
+                "account": self.account_number,
+                "instrument": self._instr(symbol),
                 "symbol": symbol,
-                "type": "market",
-                "time_in_force": "gtc",
-                "trigger": "immediate",
-                "quantity": str(quantity),
-                "side": "buy"
-            })
+                "quantity": str(quantity)
+            }
+            payload = json_dumps({**_ORDER_TEMPLATE, **common, "side": "buy"})
             order = make_post_or_get_request(url, payload, "POST")
             
             if order['status'] == 'filled':
@@ -138,28 +172,21 @@ class SmartTrader:
                 profit_price = price * (1 + self.profit_target_percentage)
                 
                 # Set stop loss
-                stop_loss_payload = json.dumps({
-                    "account": load_account_profile()['account_number'],
-                    "instrument": f"https://api.robinhood.com/instruments/{symbol}/",
-                    "symbol": symbol,
-                    "type": "market",
-                    "time_in_force": "gtc",
+                stop_loss_payload = json_dumps({
+                    **_ORDER_TEMPLATE,
+                    **common,
                     "trigger": "stop",
                     "stop_price": str(stop_price),
-                    "quantity": str(quantity),
                     "side": "sell"
                 })
                 make_post_or_get_request(url, stop_loss_payload, "POST")
                 
                 # Set take profit
-                take_profit_payload = json.dumps({
-                    "account": load_account_profile()['account_number'],
-                    "instrument": f"https://api.robinhood.com/instruments/{symbol}/",
-                    "symbol": symbol,
+                take_profit_payload = json_dumps({
+                    **common,
                     "type": "limit",
                     "time_in_force": "gtc",
                     "price": str(profit_price),
-                    "quantity": str(quantity),
                     "side": "sell"
                 })
                 
@@ -169,34 +196,35 @@ class SmartTrader:
                     'stop_loss': stop_price,
                     'take_profit': profit_price
                 }
-                print(f"Bought {quantity} shares of {symbol} at {price}")
+                log.info("Bought %s shares of %s at %s", quantity, symbol, price)
         except Exception as e:
-            print(f"Error placing buy order for {symbol}: {str(e)}")
+            log.error("Error placing buy order for %s: %s", symbol, e)
 
     def check_positions(self):
         """Monitor open positions and update daily P/L"""
         try:
-            positions = get_open_stock_positions()
-            for position in positions:
-                symbol = position['symbol']
-                quantity = float(position['quantity'])
-                if quantity > 0:
-                    current_price = float(get_current_stock_price(symbol))
-                    entry_price = float(position['average_buy_price'])
-                    pl = (current_price - entry_price) * quantity
-                    
-                    if pl > 0:
-                        self.daily_profit += pl
-                    else:
-                        self.daily_loss -= pl
-                        
-                    # Check if we hit daily limits
-                    # if self.daily_loss >= self.max_daily_loss or self.daily_profit >= self.max_daily_profit:
-                    #     self.close_all_positions()
-                    #     print("Daily limit reached. Closing all positions.")
-                    #     return
+            positions = [p for p in get_open_stock_positions() if float(p['quantity']) > 0]
+            if not positions:
+                return
+
+            # One batched quote request for every held symbol
+            prices = get_current_stock_prices([p['symbol'] for p in positions])
+            n = len(positions)
+            current = np.fromiter((prices[p['symbol']] for p in positions), dtype=np.float64, count=n)
+            entry = np.fromiter((p['average_buy_price'] for p in positions), dtype=np.float64, count=n)
+            quantity = np.fromiter((p['quantity'] for p in positions), dtype=np.float64, count=n)
+            pls = (current - entry) * quantity
+
+            self.daily_profit += float(np.clip(pls, 0, None).sum())
+            self.daily_loss += float(np.clip(-pls, 0, None).sum())
+
+            # Check if we hit daily limits
+            # if self.daily_loss >= self.max_daily_loss or self.daily_profit >= self.max_daily_profit:
+            #     self.close_all_positions()
+            #     log.info("Daily limit reached. Closing all positions.")
+            #     return
         except Exception as e:
-            print(f"Error checking positions: {str(e)}")
+            log.error("Error checking positions: %s", e)
 
     def close_all_positions(self):
         """Close all open positions"""
@@ -207,20 +235,18 @@ class SmartTrader:
                 quantity = float(position['quantity'])
                 if quantity > 0:
                     url = "https://api.robinhood.com/orders/"
-                    payload = json.dumps({
-                        "account": load_account_profile()['account_number'],
-                        "instrument": f"https://api.robinhood.com/instruments/{symbol}/",
+                    payload = json_dumps({
+                        **_ORDER_TEMPLATE,
+                        "account": self.account_number,
+                        "instrument": self._instr(symbol),
                         "symbol": symbol,
-                        "type": "market",
-                        "time_in_force": "gtc",
-                        "trigger": "immediate",
                         "quantity": str(quantity),
                         "side": "sell"
                     })
                     make_post_or_get_request(url, payload, "POST")
-                    print(f"Closed position in {symbol}")
+                    log.info("Closed position in %s", symbol)
         except Exception as e:
-            print(f"Error closing positions: {str(e)}")
+            log.error("Error closing positions: %s", e)
 
     def run_trading_session(self):
         """Main trading loop with parallel processing"""
@@ -233,39 +259,48 @@ class SmartTrader:
         
         while True:
             # Convert current time to ET
-            current_time = datetime.now(ZoneInfo('America/New_York')).time()
-            market_open = datetime.strptime('09:30', '%H:%M').time()
-            market_close = datetime.strptime('16:00', '%H:%M').time()
+            now = datetime.now(NY_TZ)
             
-            # Only trade during market hours (9:30 AM - 4:00 PM ET)
-            if market_open <= current_time <= market_close:
-                # Get buying power first
-                buying_power = self.get_buying_power()
-                
-                # Check current positions
-                self.check_positions()
-                
-                # Analyze each symbol sequentially
-                for symbol in watchlist:
-                    try:
-                        should_buy, price, position_multiplier = self.analyze_stock(symbol)
-                        if should_buy and buying_power > price * 100:  # Minimum 100 shares
-                            send_notification(f"{symbol} BUY")
-                            base_quantity = int(buying_power / price)
-                            adjusted_quantity = int(base_quantity * position_multiplier)
-                            if adjusted_quantity >= 100:  # Ensure we still meet minimum
-                                self.place_buy_order(symbol, price, adjusted_quantity)
-                    except Exception as e:
-                        print(f"Error processing {symbol}: {str(e)}")
-                
-            time.sleep(5)  # Check every minute
+            # Only trade during market hours (9:30 AM - 4:00 PM ET); outside them
+            # sleep until the next open, waking at least hourly to re-check
+            if not MARKET_OPEN <= now.time() <= MARKET_CLOSE:
+                time.sleep(min(_seconds_until_open(now), 3600))
+                continue
+
+            # Get buying power first
+            buying_power = self.get_buying_power()
+            
+            # Check current positions
+            self.check_positions()
+            
+            # Analyze all symbols concurrently, then place buys one at a time
+            # since they share the buying power
+            futures = {symbol: self._pool.submit(self.analyze_stock, symbol) for symbol in watchlist}
+            for symbol, future in futures.items():
+                try:
+                    should_buy, price, position_multiplier = future.result()
+                    if should_buy and buying_power > price * 100:  # Minimum 100 shares
+                        self._notif_q.put_nowait(f"{symbol} BUY")
+                        base_quantity = int(buying_power / price)
+                        adjusted_quantity = int(base_quantity * position_multiplier)
+                        if adjusted_quantity >= 100:  # Ensure we still meet minimum
+                            self.place_buy_order(symbol, price, adjusted_quantity)
+                except Exception as e:
+                    log.error("Error processing %s: %s", symbol, e)
+
+            # Wake on the next 5 second boundary so ticks don't drift
+            time.sleep(TICK_SECONDS - (time.monotonic() % TICK_SECONDS))
 
     def start(self):
         """Start the trading bot"""
+        # Show the trade log by default; no-op if the application already configured logging
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
         try:
-            print("Starting SmartTrader bot...")
+            log.info("Starting SmartTrader bot...")
             self.run_trading_session()
         except KeyboardInterrupt:
-            print("Shutting down bot...")
+            log.info("Shutting down bot...")
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            close()
             # self.close_all_positions()
             # rh.logout()